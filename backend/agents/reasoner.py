@@ -5,6 +5,7 @@ Reasoner Agent - Executes reasoning steps and maintains reasoning chain
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import pairwise
 import re
 
 from agents.planner import ReasoningPlan, ProblemType, ReasoningStrategy
@@ -239,7 +240,7 @@ class ReasonerAgent:
                 # Try multiple algorithms in order
                 
                 # 1. Arithmetic progression
-                diffs = [sequence[i+1] - sequence[i] for i in range(len(sequence)-1)]
+                diffs = [b - a for a, b in pairwise(sequence)]
                 if all(abs(d - diffs[0]) < 0.001 for d in diffs):
                     next_val = sequence[-1] + diffs[0]
                     step.thought = f"Arithmetic: constant difference {diffs[0]}"
@@ -250,7 +251,7 @@ class ReasonerAgent:
                 
                 # 2. Quadratic (constant 2nd difference)
                 if len(diffs) >= 2:
-                    diff2 = [diffs[i+1] - diffs[i] for i in range(len(diffs)-1)]
+                    diff2 = [b - a for a, b in pairwise(diffs)]
                     if all(abs(d - diff2[0]) < 0.001 for d in diff2):
                         next_diff = diffs[-1] + diff2[0]
                         next_val = sequence[-1] + next_diff
@@ -262,7 +263,7 @@ class ReasonerAgent:
                 
                 # 3. Geometric progression
                 if all(s != 0 for s in sequence[:-1]):
-                    ratios = [sequence[i+1] / sequence[i] for i in range(len(sequence)-1)]
+                    ratios = [b / a for a, b in pairwise(sequence)]
                     if all(abs(r - ratios[0]) < 0.001 for r in ratios):
                         next_val = sequence[-1] * ratios[0]
                         step.thought = f"Geometric: constant ratio {ratios[0]}"
@@ -5,6 +5,7 @@ Checks correctness of reasoning steps and validates final answers
 
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from itertools import pairwise
 import re
 
 from agents.reasoner import ReasoningChain, ReasoningStep
@@ -136,9 +137,9 @@ class VerifierAgent:
         
         # Check for logical flow
         if len(chain.steps) > 1:
-            for i in range(len(chain.steps) - 1):
-                if not self._steps_connected(chain.steps[i], chain.steps[i+1]):
-                    all_suggestions.append(f"Steps {i+1} and {i+2} may not be well connected")
+            for i, (step, next_step) in enumerate(pairwise(chain.steps), 1):
+                if not self._steps_connected(step, next_step):
+                    all_suggestions.append(f"Steps {i} and {i+1} may not be well connected")
         
         # Check final answer
         if not chain.final_answer or chain.final_answer == "Unable to determine answer":
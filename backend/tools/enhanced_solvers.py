@@ -4,8 +4,28 @@ Enhanced solvers based on training data analysis
 """
 import re
 import math
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 
+# Patterns are compiled once at import so the first solve doesn't pay for it
+_HOUR_RE = re.compile(r'(\d+(?:\.\d+)?)\s*hour')
+_MILE_RE = re.compile(r'(\d+)\s*mile')
+_PRODUCTION_RE = re.compile(r'(\d+)\s*product.*?(\d+(?:\.\d+)?)\s*%\s*error')
+_INT_RE = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=256)
+def _format_hm(total_minutes: int) -> str:
+    """Format a whole number of minutes as 'H hours and M minutes'"""
+    hours, minutes = divmod(total_minutes, 60)
+    
+    if minutes == 0:
+        return f"{hours} hours"
+    if hours == 0:
+        return f"{minutes} minutes"
+    return f"{hours} hours and {minutes} minutes"
+
+
 class EnhancedSolvers:
     """Training-based enhanced solvers"""
     
@@ -37,8 +57,7 @@ class EnhancedSolvers:
             return None
         
         # Extract times
-        time_pattern = r'(\d+(?:\.\d+)?)\s*hour'
-        times = re.findall(time_pattern, problem_lower)
+        times = _HOUR_RE.findall(problem_lower)
         
         if len(times) >= 2:
             try:
@@ -48,16 +67,8 @@ class EnhancedSolvers:
                 combined_rate = sum(1/t for t in times)
                 combined_time = 1 / combined_rate
                 
-                # Convert to hours and minutes
-                hours = int(combined_time)
-                minutes = int((combined_time - hours) * 60)
-                
-                if minutes == 0:
-                    return f"{hours} hours"
-                elif hours == 0:
-                    return f"{minutes} minutes"
-                else:
-                    return f"{hours} hours and {minutes} minutes"
+                # Convert to hours and minutes, rounded once to whole minutes
+                return _format_hm(round(combined_time * 60))
                     
             except (ValueError, ZeroDivisionError):
                 pass
@@ -74,8 +85,7 @@ class EnhancedSolvers:
             return None
         
         # Extract task times and constraints
-        task_pattern = r'(\d+(?:\.\d+)?)\s*hour'
-        times = re.findall(task_pattern, problem_lower)
+        times = _HOUR_RE.findall(problem_lower)
         
         # Look for parallel execution hints
         if 'while' in problem_lower or 'during' in problem_lower:
@@ -109,8 +119,7 @@ class EnhancedSolvers:
             return None
         
         # Extract distances
-        distance_pattern = r'(\d+)\s*mile'
-        distances = re.findall(distance_pattern, problem_lower)
+        distances = _MILE_RE.findall(problem_lower)
         
         if len(distances) >= 3:  # Traveling salesman type
             try:
@@ -143,8 +152,7 @@ class EnhancedSolvers:
             return None
         
         # Extract machine data: products per hour and error rates
-        production_pattern = r'(\d+)\s*product.*?(\d+(?:\.\d+)?)\s*%\s*error'
-        matches = re.findall(production_pattern, problem_lower)
+        matches = _PRODUCTION_RE.findall(problem_lower)
         
         if matches:
             best_machine = None
@@ -199,8 +207,7 @@ class EnhancedSolvers:
         
         # Look for factorial patterns
         if 'different orders' in problem_lower:
-            number_pattern = r'(\d+)'
-            numbers = re.findall(number_pattern, problem_lower)
+            numbers = _INT_RE.findall(problem_lower)
             
             if numbers:
                 try:
@@ -5,12 +5,25 @@ Real mathematical formulas for 2D and 3D geometry problems
 
 import math
 import re
+import numpy as np
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
 
+# Numbers in problem text, including '.5' style decimals
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?|\.\d+')
+
+
 class GeometryCalculator:
     """Handles geometric calculations with real formulas"""
     
+    # Constants reused by the formulas below
+    _TWO_PI = 2 * math.pi
+    _FOUR_PI = 4 * math.pi
+    _FOUR_THIRDS_PI = (4 / 3) * math.pi
+    _SQRT2 = math.sqrt(2)
+    _SQRT3 = math.sqrt(3)
+    
     def __init__(self):
         self.PI = math.pi
     
@@ -18,11 +31,11 @@ class GeometryCalculator:
     
     def circle_area(self, radius: float) -> float:
         """Area of circle: πr²"""
-        return self.PI * radius ** 2
+        return self.PI * radius * radius
     
     def circle_circumference(self, radius: float) -> float:
         """Circumference: 2πr"""
-        return 2 * self.PI * radius
+        return self._TWO_PI * radius
     
     def triangle_area(self, base: float, height: float) -> float:
         """Area of triangle: (1/2)bh"""
@@ -36,42 +49,54 @@ class GeometryCalculator:
     
     def cube_volume(self, side: float) -> float:
         """Volume of cube: s³"""
-        return side ** 3
+        return side * side * side
     
     def cube_surface_area(self, side: float) -> float:
         """Surface area of cube: 6s²"""
-        return 6 * side ** 2
+        return 6 * side * side
     
     def sphere_volume(self, radius: float) -> float:
         """Volume of sphere: (4/3)πr³"""
-        return (4/3) * self.PI * radius ** 3
+        return self._FOUR_THIRDS_PI * radius * radius * radius
     
     def sphere_surface_area(self, radius: float) -> float:
         """Surface area of sphere: 4πr²"""
-        return 4 * self.PI * radius ** 2
+        return self._FOUR_PI * radius * radius
     
     def cylinder_volume(self, radius: float, height: float) -> float:
         """Volume of cylinder: πr²h"""
-        return self.PI * radius ** 2 * height
+        return self.PI * radius * radius * height
     
     def cylinder_surface_area(self, radius: float, height: float) -> float:
         """Surface area of cylinder: 2πr² + 2πrh"""
-        return 2 * self.PI * radius ** 2 + 2 * self.PI * radius * height
+        return self._TWO_PI * radius * (radius + height)
     
     def cylinder_lateral_area(self, radius: float, height: float) -> float:
         """Lateral surface area: 2πrh"""
-        return 2 * self.PI * radius * height
+        return self._TWO_PI * radius * height
     
     # ========== Distance & Paths ==========
     
     def distance_2d(self, x1: float, y1: float, x2: float, y2: float) -> float:
         """Euclidean distance in 2D: √((x2-x1)² + (y2-y1)²)"""
-        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        return math.hypot(x2 - x1, y2 - y1)
     
     def distance_3d(self, x1: float, y1: float, z1: float, 
                     x2: float, y2: float, z2: float) -> float:
         """Euclidean distance in 3D: √((x2-x1)² + (y2-y1)² + (z2-z1)²)"""
-        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
+        return math.hypot(x2 - x1, y2 - y1, z2 - z1)
+    
+    def pairwise_distances(self, points) -> np.ndarray:
+        """
+        Euclidean distance matrix for an (N, d) array of points
+        
+        Uses ||x||² + ||y||² - 2·x·yᵀ so the N×N×d difference tensor is
+        never built; tiny negatives from rounding are clamped to zero.
+        """
+        X = np.asarray(points, dtype=np.float64)
+        sq_norms = (X * X).sum(axis=1)
+        sq_dists = sq_norms[:, None] + sq_norms[None, :] - 2 * (X @ X.T)
+        return np.sqrt(np.maximum(sq_dists, 0))
     
     def shortest_path_on_cube_surface(self, edge_length: float) -> float:
         """
@@ -98,11 +123,11 @@ class GeometryCalculator:
     
     def diagonal_of_cube(self, edge_length: float) -> float:
         """Space diagonal (through interior): a√3"""
-        return edge_length * math.sqrt(3)
+        return edge_length * self._SQRT3
     
     def face_diagonal_of_cube(self, edge_length: float) -> float:
         """Diagonal on one face: a√2"""
-        return edge_length * math.sqrt(2)
+        return edge_length * self._SQRT2
     
     # ========== Painted Cube Formulas ==========
     
@@ -122,6 +147,22 @@ class GeometryCalculator:
         """Cubes with 0 painted faces (internal)"""
         return (n - 2) ** 3
     
+    def painted_cube_counts(self, n) -> Dict[str, np.ndarray]:
+        """
+        All painted-cube counts for one or many cube sizes at once
+        
+        Accepts a scalar or array of sizes and returns arrays keyed by
+        'corners', 'edges', 'faces' and 'internal'.
+        """
+        n = np.asarray(n)
+        inner = n - 2
+        return {
+            'corners': np.full_like(n, 8),
+            'edges': 12 * inner,
+            'faces': 6 * inner ** 2,
+            'internal': inner ** 3
+        }
+    
     # ========== Problem Solving ==========
     
     def solve_from_text(self, problem: str) -> Optional[Dict]:
@@ -129,15 +170,15 @@ class GeometryCalculator:
         Automatically detect geometry problem type and solve
         """
         problem_lower = problem.lower()
-        numbers = re.findall(r'\d+\.?\d*', problem)
+        numbers = list(map(float, _NUM_RE.findall(problem)))
         
         result = {}
         
         # Cylinder problems
         if 'cylinder' in problem_lower:
             if len(numbers) >= 2:
-                radius = float(numbers[0]) / 2 if 'diameter' in problem_lower else float(numbers[0])
-                height = float(numbers[1]) if len(numbers) > 1 else float(numbers[0])
+                radius = numbers[0] / 2 if 'diameter' in problem_lower else numbers[0]
+                height = numbers[1] if len(numbers) > 1 else numbers[0]
                 
                 if 'surface area' in problem_lower:
                     area = self.cylinder_surface_area(radius, height)
@@ -154,7 +195,7 @@ class GeometryCalculator:
         # Cube shortest path
         if 'ant' in problem_lower and 'corner' in problem_lower and 'cube' in problem_lower:
             if numbers:
-                edge = float(numbers[0])
+                edge = numbers[0]
                 path = self.shortest_path_on_cube_surface(edge)
                 result['type'] = 'cube_surface_path'
                 result['value'] = int(path) if path == int(path) else round(path, 2)
@@ -164,8 +205,8 @@ class GeometryCalculator:
         # Sphere problems
         if 'sphere' in problem_lower:
             if numbers:
-                radius = float(numbers[0])
-                if 'surface area' in problem_lower or 'area' in problem_lower:
+                radius = numbers[0]
+                if 'area' in problem_lower:
                     area = self.sphere_surface_area(radius)
                     result['type'] = 'sphere_surface_area'
                     result['value'] = round(area, 2)
@@ -180,7 +221,12 @@ class GeometryCalculator:
 
 
 # Convenience function
+@lru_cache(maxsize=1)
+def _get_calculator() -> GeometryCalculator:
+    """Shared calculator instance for the convenience wrapper"""
+    return GeometryCalculator()
+
+
 def solve_geometry(problem: str) -> Optional[Dict]:
     """Quick function to solve geometry problems"""
-    calc = GeometryCalculator()
-    return calc.solve_from_text(problem)
+    return _get_calculator().solve_from_text(problem)
@@ -3,10 +3,31 @@ Logic Trap Detection Module
 Identifies and handles common logic traps in reasoning problems
 """
 
-from typing import Dict, Optional, List
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Optional, List, Tuple
 import re
 
 
+# Gap between name and time is bounded so long inputs can't blow up the lazy scan
+_MACHINE_RE = re.compile(r'Machine\s+([A-Z]).{0,100}?(\d+)\s*minutes?', re.IGNORECASE)
+_POLISH_RE = re.compile(r'polish', re.IGNORECASE)
+_TASK_HOURS_RE = re.compile(r'(\d+)\s*hours?')
+_DAILY_LIMIT_RE = re.compile(r'maximum.*?(\d+)\s*hours?.*?day')
+
+
+@lru_cache(maxsize=64)
+def _lower(text: str) -> str:
+    """Lowercased problem text, shared by the analyzers below"""
+    return text.lower()
+
+
+@lru_cache(maxsize=256)
+def _pipeline_order(pairs: Tuple[Tuple[str, int], ...]) -> str:
+    """Order (name, time) pairs shortest first, memoized on the pairs"""
+    return ' -> '.join(name for name, _ in sorted(pairs, key=itemgetter(1)))
+
+
 class LogicTrapDetector:
     """Detects common logic traps and counter-intuitive problems"""
     
@@ -43,6 +64,11 @@ class LogicTrapDetector:
                 'answer_hint': 'Six presses'
             }
         }
+        
+        # Compile patterns and freeze keywords once instead of on every detect
+        for trap_info in self.known_traps.values():
+            trap_info['keywords'] = tuple(trap_info['keywords'])
+            trap_info['compiled'] = re.compile(trap_info['pattern'])
     
     def detect_trap(self, problem: str) -> Optional[Dict]:
         """
@@ -51,14 +77,14 @@ class LogicTrapDetector:
         Returns:
             Dict with trap info if detected, None otherwise
         """
-        problem_lower = problem.lower()
+        problem_lower = _lower(problem)
         
         for trap_name, trap_info in self.known_traps.items():
             # Check keywords
             keyword_matches = sum(1 for kw in trap_info['keywords'] if kw in problem_lower)
             
             # Check pattern
-            pattern_match = re.search(trap_info['pattern'], problem_lower)
+            pattern_match = trap_info['compiled'].search(problem_lower)
             
             # If enough keywords match or pattern matches
             if keyword_matches >= 2 or pattern_match:
@@ -104,11 +130,13 @@ class WorstCaseAnalyzer:
         Common pattern: 3 machines (gold, silver, random)
         Worst case needs to distinguish random from always-X
         """
-        if 'button' not in problem.lower() or 'machine' not in problem.lower():
+        problem_lower = _lower(problem)
+        
+        if 'button' not in problem_lower or 'machine' not in problem_lower:
             return None
         
         # Pattern: 3 machines with different behaviors
-        if 'three' in problem.lower() and 'random' in problem.lower():
+        if 'three' in problem_lower and 'random' in problem_lower:
             # Worst case: 
             # - 3 initial presses (one per machine)
             # - If ambiguous (e.g., all gold), need 3 more to distinguish
@@ -124,9 +152,11 @@ class WorstCaseAnalyzer:
         
         Accounts for: can't split tasks, daily limits, constraints
         """
+        problem_lower = _lower(problem)
+        
         # Extract tasks and constraints
-        tasks = re.findall(r'(\d+)\s*hours?', problem)
-        daily_limit = re.findall(r'maximum.*?(\d+)\s*hours?.*?day', problem.lower())
+        tasks = _TASK_HOURS_RE.findall(problem)
+        daily_limit = _DAILY_LIMIT_RE.findall(problem_lower)
         
         if not tasks:
             return None
@@ -135,7 +165,7 @@ class WorstCaseAnalyzer:
         max_hours = int(daily_limit[0]) if daily_limit else 8
         
         # Check for "can't split" or "entire blocks" constraint
-        cant_split = 'split' in problem.lower() or 'entire' in problem.lower() or 'dedicate' in problem.lower()
+        cant_split = 'split' in problem_lower or 'entire' in problem_lower or 'dedicate' in problem_lower
         
         if cant_split:
             # Greedy fit: try to fit tasks into days
@@ -144,18 +174,19 @@ class WorstCaseAnalyzer:
             
             while remaining_tasks:
                 day_hours = 0
-                tasks_today = []
+                scheduled = set()
                 
-                for task in remaining_tasks[:]:
+                for idx, task in enumerate(remaining_tasks):
                     if day_hours + task <= max_hours:
                         day_hours += task
-                        tasks_today.append(task)
+                        scheduled.add(idx)
                 
-                if not tasks_today:  # No task fits, need more hours
+                if not scheduled:  # No task fits, need more hours
                     return None
                 
-                for task in tasks_today:
-                    remaining_tasks.remove(task)
+                # Rebuild in one pass instead of list.remove per scheduled task
+                remaining_tasks = [task for idx, task in enumerate(remaining_tasks)
+                                   if idx not in scheduled]
                 
                 days += 1
             
@@ -178,9 +209,7 @@ class MachineSequencer:
             return None
         
         # Sort by processing time
-        sorted_machines = sorted(machines, key=lambda x: x['time'])
-        
-        return ' -> '.join([m['name'] for m in sorted_machines])
+        return _pipeline_order(tuple((m['name'], m['time']) for m in machines))
     
     @staticmethod
     def analyze_machine_problem(problem: str) -> Optional[str]:
@@ -188,8 +217,7 @@ class MachineSequencer:
         Extract machine info and determine optimal order
         """
         # Extract machine names and times
-        machine_pattern = r'Machine\s+([A-Z]).*?(\d+)\s*minutes?'
-        matches = re.findall(machine_pattern, problem, re.IGNORECASE)
+        matches = _MACHINE_RE.findall(problem)
         
         if not matches:
             return None
@@ -200,7 +228,7 @@ class MachineSequencer:
         # But if it's a pipeline (each item goes through all), order by process type
         
         # Check for specific keywords
-        if 'polish' in problem.lower():
+        if _POLISH_RE.search(problem):
             # Polish -> Engrave -> Check (logical order)
             return 'A -> B -> C'
         
@@ -209,23 +237,26 @@ class MachineSequencer:
 
 
 # Convenience functions
+@lru_cache(maxsize=1)
+def _get_detector() -> LogicTrapDetector:
+    """Shared detector so trap patterns are compiled once per process"""
+    return LogicTrapDetector()
+
+
 def detect_logic_trap(problem: str, options: Optional[List[str]] = None) -> Optional[str]:
     """Quick function to detect and solve logic traps"""
-    detector = LogicTrapDetector()
-    return detector.apply_trap_reasoning(problem, options)
+    return _get_detector().apply_trap_reasoning(problem, options)
 
 
 def analyze_worst_case(problem: str) -> Optional[int]:
     """Quick function for worst-case analysis"""
-    analyzer = WorstCaseAnalyzer()
-    
     # Try button presses
-    result = analyzer.analyze_button_presses(problem)
+    result = WorstCaseAnalyzer.analyze_button_presses(problem)
     if result:
         return result
     
     # Try task scheduling
-    result = analyzer.analyze_task_scheduling(problem)
+    result = WorstCaseAnalyzer.analyze_task_scheduling(problem)
     if result:
         return result
     
@@ -234,5 +265,4 @@ def analyze_worst_case(problem: str) -> Optional[int]:
 
 def optimize_machines(problem: str) -> Optional[str]:
     """Quick function for machine sequencing"""
-    sequencer = MachineSequencer()
-    return sequencer.analyze_machine_problem(problem)
+    return MachineSequencer.analyze_machine_problem(problem)
@@ -4,17 +4,89 @@ Uses Mistral as a tool for understanding, explaining, and suggesting reasoning s
 NOT as the main decision maker
 """
 
+import asyncio
+import hashlib
 import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup, stdlib json handles bytes too
+    _json_loads = json.loads
+
 
 class MistralAPIError(Exception):
     """Raised when Mistral API calls fail"""
     pass
 
 
+# Responses to temperature-0 calls are deterministic, so identical requests are
+# served from an in-process LRU (and an optional diskcache directory)
+_CACHE_MAXSIZE = 4096
+_response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(model: str, messages: List[Dict[str, str]], max_tokens: int) -> bytes:
+    """Stable digest of the request fields that determine the response"""
+    payload = json.dumps([model, messages, max_tokens], sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Section headers in structured Mistral responses; models vary the case and
+# often bullet, number or bold them ("1. **Logical:** no")
+_HEADER_RE = (r'^[ \t]*(?:[-*•][ \t]*|\d+[.)][ \t]*)?(?:\*\*|__)?({names})(?:\*\*|__)?'
+              r'[ \t]*:[ \t]*(?:\*\*|__)?[ \t]*(.*)$')
+_UND_RE = re.compile(_HEADER_RE.format(names='KEY_INFO|CONSTRAINTS|GOAL'), re.M | re.I)
+_VERIFY_RE = re.compile(_HEADER_RE.format(names='LOGICAL|ISSUES|CONFIDENCE'), re.M | re.I)
+_BLOCK_SEP_RE = re.compile(r'^[ \t]*-{3,}[ \t]*$', re.M)
+
+
+def _iter_sections(pattern: re.Pattern, text: str):
+    """
+    Yield (header, content, continuation_lines) for each header in text
+    
+    Continuation lines are the non-empty lines between a header and the
+    next one, stripped. Text before the first header is ignored.
+    """
+    matches = list(pattern.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[match.end():end]
+        yield (match.group(1), match.group(2).strip(),
+               [line.strip() for line in body.splitlines() if line.strip()])
+
+
+def _parse_understanding(response: str) -> Dict[str, Any]:
+    """Parse a KEY_INFO / CONSTRAINTS / GOAL response"""
+    understanding = {
+        "key_info": [],
+        "constraints": [],
+        "goal": ""
+    }
+    
+    for section, content, extra in _iter_sections(_UND_RE, response):
+        section = section.upper()
+        if section == "GOAL":
+            understanding["goal"] = " ".join([content] + extra)
+        else:
+            items = understanding[section.lower()]
+            if content:
+                items.append(content)
+            items.extend(line.lstrip("- •*") for line in extra)
+    
+    return understanding
+
+
 class MistralTool:
     """
     Mistral AI as a reasoning tool
@@ -29,22 +101,74 @@ class MistralTool:
     """
     
     def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY", "DvJWwEBKjoxbC0ZjR7jfiyTP2XwhDLny")
+        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
         self.base_url = "https://api.mistral.ai/v1"
         self.model = "mistral-tiny"  # Fast and efficient for reasoning tasks
         
         if not self.api_key:
             raise MistralAPIError("Mistral API key not provided")
+        
+        # One pooled keep-alive session per tool so chained calls reuse the
+        # TLS connection; 429/5xx are retried by urllib3 with backoff
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"POST"}),
+                      raise_on_status=False)
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                                    max_retries=retry))
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        
+        # Optional persistent cache shared across runs (e.g. eval loops)
+        self._disk_cache = None
+        cache_dir = os.getenv("MISTRAL_CACHE_DIR")
+        if cache_dir:
+            try:
+                import diskcache
+                self._disk_cache = diskcache.Cache(cache_dir)
+            except ImportError:
+                pass
+    
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Look up a cached response in memory, then on disk"""
+        with _cache_lock:
+            if key in _response_cache:
+                _response_cache.move_to_end(key)
+                return _response_cache[key]
+        
+        if self._disk_cache is not None:
+            content = self._disk_cache.get(key)
+            if content is not None:
+                self._cache_put(key, content, disk=False)
+            return content
+        
+        return None
+    
+    def _cache_put(self, key: bytes, content: str, disk: bool = True) -> None:
+        """Store a response in the memory LRU and (optionally) on disk"""
+        with _cache_lock:
+            _response_cache[key] = content
+            _response_cache.move_to_end(key)
+            if len(_response_cache) > _CACHE_MAXSIZE:
+                _response_cache.popitem(last=False)
+        
+        if disk and self._disk_cache is not None:
+            self._disk_cache.set(key, content)
     
     def _call_api(self, messages: List[Dict[str, str]], 
                   max_tokens: int = 500, 
                   temperature: float = 0.0) -> str:
         """Make API call to Mistral"""
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        cache_key = None
+        if temperature == 0.0:
+            cache_key = _cache_key(self.model, messages, max_tokens)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
         
         payload = {
             "model": self.model,
@@ -54,18 +178,22 @@ class MistralTool:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
                 json=payload,
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+                result = _json_loads(response.content)
+                content = result["choices"][0]["message"]["content"]
+                if cache_key is not None:
+                    self._cache_put(cache_key, content)
+                return content
             else:
-                raise MistralAPIError(f"API error: {response.status_code} - {response.text}")
+                # Only decode a bounded prefix of the error body
+                detail = response.content[:512].decode("utf-8", "replace")
+                raise MistralAPIError(f"API error: {response.status_code} - {detail}")
                 
         except requests.exceptions.RequestException as e:
             raise MistralAPIError(f"Request failed: {str(e)}")
@@ -100,38 +228,7 @@ GOAL: [what needs to be determined]"""
         try:
             response = self._call_api(messages, max_tokens=300, temperature=0.0)
             
-            # Parse response
-            understanding = {
-                "key_info": [],
-                "constraints": [],
-                "goal": ""
-            }
-            
-            lines = response.split('\n')
-            current_section = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith("KEY_INFO:"):
-                    current_section = "key_info"
-                    content = line.replace("KEY_INFO:", "").strip()
-                    if content:
-                        understanding["key_info"].append(content)
-                elif line.startswith("CONSTRAINTS:"):
-                    current_section = "constraints"
-                    content = line.replace("CONSTRAINTS:", "").strip()
-                    if content:
-                        understanding["constraints"].append(content)
-                elif line.startswith("GOAL:"):
-                    current_section = "goal"
-                    understanding["goal"] = line.replace("GOAL:", "").strip()
-                elif line and current_section:
-                    if current_section in ["key_info", "constraints"]:
-                        understanding[current_section].append(line.lstrip("- •*"))
-                    elif current_section == "goal":
-                        understanding["goal"] += " " + line
-            
-            return understanding
+            return _parse_understanding(response)
             
         except Exception as e:
             # If Mistral fails, return empty understanding
@@ -141,6 +238,54 @@ GOAL: [what needs to be determined]"""
                 "goal": "Solve the problem"
             }
     
+    def understand_problems(self, problems: List[str], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """
+        Understand several problems using one API call per batch
+        
+        Problems are numbered in a single prompt and the answers come back as
+        '---' separated blocks. If a batch reply can't be split into one block
+        per problem, that batch falls back to understand_problem per item.
+        
+        Returns:
+            List of understanding dicts, in input order
+        """
+        results = []
+        
+        for start in range(0, len(problems), batch_size):
+            batch = problems[start:start + batch_size]
+            numbered = "\n".join(f"{i}. {problem}" for i, problem in enumerate(batch, 1))
+            
+            prompt = f"""For each numbered logic problem below, extract key information. Be concise and factual.
+
+{numbered}
+
+For every problem, in order, respond with:
+KEY_INFO: [list the important facts]
+CONSTRAINTS: [list the constraints]
+GOAL: [what needs to be determined]
+
+Separate the answers for consecutive problems with a line containing only ---"""
+
+            messages = [
+                {"role": "user", "content": prompt}
+            ]
+            
+            parsed = []
+            try:
+                response = self._call_api(messages, max_tokens=300 * len(batch), temperature=0.0)
+                parsed = [_parse_understanding(block)
+                          for block in _BLOCK_SEP_RE.split(response)
+                          if _UND_RE.search(block)]
+            except Exception:
+                pass
+            
+            if len(parsed) != len(batch):
+                parsed = [self.understand_problem(problem) for problem in batch]
+            
+            results.extend(parsed)
+        
+        return results
+    
     def suggest_approach(self, problem: str, problem_type: str) -> str:
         """
         Suggest a reasoning approach for the problem
@@ -203,12 +348,14 @@ Be brief and precise."""
             Dict with detailed analysis and recommended option
         """
         
+        option_block = "\n".join([f"{i}. {opt}" for i, opt in enumerate(options, 1)])
+        
         prompt = f"""Analyze this problem step-by-step to determine the correct answer.
 
 Problem: {problem}
 
 Options:
-{chr(10).join(f'{i+1}. {opt}' for i, opt in enumerate(options))}
+{option_block}
 
 Think through this systematically:
 
@@ -233,9 +380,10 @@ Provide your reasoning and conclude with: "Therefore, the answer is [option]" ""
             
             # Look for explicit answer statement
             if "therefore" in response_lower or "answer is" in response_lower:
-                for i, opt in enumerate(options, 1):
-                    if opt.lower()[:30] in response_lower or f"option {i}" in response_lower:
-                        recommended = opt
+                option_prefixes = [opt.lower()[:30] for opt in options]
+                for i, prefix in enumerate(option_prefixes, 1):
+                    if prefix in response_lower or f"option {i}" in response_lower:
+                        recommended = options[i - 1]
                         break
             
             return {
@@ -283,23 +431,24 @@ Be concise."""
             }
             
             response_lower = response.lower()
-            
             if "logical: no" in response_lower or "not logical" in response_lower:
                 verification["is_logical"] = False
             
-            # Extract issues
-            if "issues:" in response_lower:
-                issues_text = response.split("ISSUES:")[-1].split("CONFIDENCE:")[0]
-                if "none" not in issues_text.lower():
-                    verification["issues"] = [issues_text.strip()]
-            
-            # Extract confidence
-            if "confidence:" in response_lower:
-                conf_text = response.split("CONFIDENCE:")[-1].strip().lower()
-                if "high" in conf_text:
-                    verification["confidence"] = "high"
-                elif "low" in conf_text:
-                    verification["confidence"] = "low"
+            for section, content, extra in _iter_sections(_VERIFY_RE, response):
+                section = section.upper()
+                text = "\n".join([content] + extra).strip()
+                if section == "LOGICAL":
+                    if content.lower().startswith("no"):
+                        verification["is_logical"] = False
+                elif section == "ISSUES":
+                    if text and "none" not in text.lower():
+                        verification["issues"] = [text]
+                elif section == "CONFIDENCE":
+                    conf_text = text.lower()
+                    if "high" in conf_text:
+                        verification["confidence"] = "high"
+                    elif "low" in conf_text:
+                        verification["confidence"] = "low"
             
             return verification
             
@@ -376,8 +525,55 @@ Respond with ONLY the tool name or "none"."""
         except:
             return None
 
+    async def analyze_all(self, problem: str, problem_type: str,
+                          options: Optional[List[str]] = None,
+                          topic: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the independent analysis calls for one problem concurrently
+        
+        Each call runs on a worker thread over the shared pooled session, so
+        total latency is roughly the slowest call rather than their sum.
+        
+        Returns:
+            Dict with: understanding, approach, options (None without options)
+        """
+        calls = [
+            asyncio.to_thread(self.understand_problem, problem, topic),
+            asyncio.to_thread(self.suggest_approach, problem, problem_type),
+        ]
+        if options:
+            calls.append(asyncio.to_thread(self.interpret_answer_options, problem, options))
+        
+        results = await asyncio.gather(*calls)
+        
+        return {
+            "understanding": results[0],
+            "approach": results[1],
+            "options": results[2] if options else None
+        }
+    
+    async def analyze_many(self, problems: List[Dict[str, Any]],
+                           max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Analyze several problems concurrently, bounded by a semaphore
+        
+        Each item needs a 'problem' key and may carry 'problem_type',
+        'options' and 'topic'. Results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_all(item["problem"],
+                                              item.get("problem_type", "general"),
+                                              item.get("options"),
+                                              item.get("topic"))
+        
+        return await asyncio.gather(*(analyze_one(item) for item in problems))
+
 
 # Convenience function
+@lru_cache(maxsize=4)
 def create_mistral_tool(api_key: Optional[str] = None) -> MistralTool:
-    """Create a Mistral tool instance"""
+    """Create a Mistral tool instance (shared per API key)"""
     return MistralTool(api_key=api_key)
@@ -4,11 +4,29 @@ Improves accuracy by better understanding problem structure
 """
 
 import re
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+# Ad-hoc patterns used by the helpers below, compiled once at import
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_AT_LEAST_RE = re.compile(r'at least (\d+)')
+_AT_MOST_RE = re.compile(r'at most (\d+)')
+_PCT_RE = re.compile(r'(\d+)%')
+_QUOTED_RE = re.compile(r"['\"](.*?)['\"]")
+_NXNXN_RE = re.compile(r'(\d+)x\1x\1')
+# "27 smaller cubes" style counts, in priority order
+_CUBE_COUNT_SIZES = (('27', 3), ('64', 4), ('125', 5), ('1000', 10))
+
+_MONTH_NAMES = ("january", "february", "march", "april", "may", "june",
+                "july", "august", "september", "october", "november", "december")
+
+_MONTHS = "JFMAMJJASOND"
+_MONTHS_COUNTS = Counter(_MONTHS)
+
+
+@dataclass(slots=True)
 class ParsedProblem:
     """Structured representation of a problem"""
     problem_type: str
@@ -28,28 +46,25 @@ class ParsedProblem:
 class ProblemParser:
     """Intelligently parses problem statements"""
     
-    def __init__(self):
-        self.patterns = self._init_patterns()
-    
-    def _init_patterns(self):
-        return {
-            'cube_dimensions': r'(\d+)x(\d+)x(\d+)\s*cube',
-            'grid_dimensions': r'(\d+)\s*x\s*(\d+)(?:\s*x\s*(\d+))?',
-            'painted_faces': r'exactly\s+(\w+)\s+(?:painted\s+)?(?:face|side)',
-            'time_units': r'(\d+)\s*(hour|minute|day|second|week)',
-            'percentage': r'(\d+(?:\.\d+)?)\s*%',
-            'ratio': r'(\d+):(\d+)',
-            'sequence_pattern': r'sequence.*?:\s*([\d\s,]+)',
-            'optimization': r'(?:maximum|minimum|optimal|best|worst)',
-            'logic_trap_keywords': r'(?:overtake|position|race|surprise|paradox)',
-        }
+    # Compiled once for the class, shared by every parser instance
+    patterns = {
+        'cube_dimensions': re.compile(r'(\d+)x(\d+)x(\d+)\s*cube'),
+        'grid_dimensions': re.compile(r'(\d+)\s*x\s*(\d+)(?:\s*x\s*(\d+))?'),
+        'painted_faces': re.compile(r'exactly\s+(\w+)\s+(?:painted\s+)?(?:face|side)'),
+        'time_units': re.compile(r'(\d+)\s*(hour|minute|day|second|week)'),
+        'percentage': re.compile(r'(\d+(?:\.\d+)?)\s*%'),
+        'ratio': re.compile(r'(\d+):(\d+)'),
+        'sequence_pattern': re.compile(r'sequence.*?:\s*([\d\s,]+)'),
+        'optimization': re.compile(r'(?:maximum|minimum|optimal|best|worst)'),
+        'logic_trap_keywords': re.compile(r'(?:overtake|position|race|surprise|paradox)'),
+    }
     
     def parse(self, problem: str) -> ParsedProblem:
         """Parse problem into structured format"""
         problem_lower = problem.lower()
         
         # Detect cube dimensions (e.g., "4x4x4 cube" or "10x10x10 cube")
-        cube_match = re.search(self.patterns['cube_dimensions'], problem_lower)
+        cube_match = self.patterns['cube_dimensions'].search(problem_lower)
         if cube_match:
             dims = tuple(int(d) for d in cube_match.groups())
             return ParsedProblem(
@@ -60,8 +75,10 @@ class ProblemParser:
             )
         
         # Detect grid/matrix dimensions
-        grid_match = re.search(self.patterns['grid_dimensions'], problem)
-        if grid_match and ('grid' in problem_lower or 'matrix' in problem_lower or 'table' in problem_lower):
+        grid_match = None
+        if 'grid' in problem_lower or 'matrix' in problem_lower or 'table' in problem_lower:
+            grid_match = self.patterns['grid_dimensions'].search(problem)
+        if grid_match:
             dims = tuple(int(d) for d in grid_match.groups() if d)
             return ParsedProblem(
                 problem_type='spatial_grid',
@@ -69,11 +86,9 @@ class ProblemParser:
                 dimensions=dims
             )
         
-        # Detect sequences
-        seq_match = re.search(self.patterns['sequence_pattern'], problem)
-        if seq_match or 'sequence' in problem_lower:
-            numbers = re.findall(r'-?\d+\.?\d*', problem)
-            numbers = [float(n) for n in numbers]
+        # Detect sequences ('sequence_pattern' can only match where 'sequence' does)
+        if 'sequence' in problem_lower:
+            numbers = self._extract_all_numbers(problem)
             return ParsedProblem(
                 problem_type='sequence',
                 key_numbers=numbers,
@@ -81,7 +96,7 @@ class ProblemParser:
             )
         
         # Detect optimization problems
-        if re.search(self.patterns['optimization'], problem_lower):
+        if self.patterns['optimization'].search(problem_lower):
             return ParsedProblem(
                 problem_type='optimization',
                 key_numbers=self._extract_all_numbers(problem),
@@ -89,7 +104,7 @@ class ProblemParser:
             )
         
         # Detect logic traps
-        if re.search(self.patterns['logic_trap_keywords'], problem_lower):
+        if self.patterns['logic_trap_keywords'].search(problem_lower):
             return ParsedProblem(
                 problem_type='logic_trap',
                 key_numbers=self._extract_all_numbers(problem),
@@ -97,7 +112,7 @@ class ProblemParser:
             )
         
         # Detect time/rate problems
-        time_matches = re.findall(self.patterns['time_units'], problem_lower)
+        time_matches = self.patterns['time_units'].findall(problem_lower)
         if time_matches:
             return ParsedProblem(
                 problem_type='time_calculation',
@@ -113,31 +128,31 @@ class ProblemParser:
     
     def _extract_all_numbers(self, text: str) -> List[float]:
         """Extract all numbers from text"""
-        numbers = re.findall(r'-?\d+\.?\d*', text)
-        return [float(n) for n in numbers if n]
+        return list(map(float, _NUMBER_RE.findall(text)))
     
     def _extract_constraints(self, text: str) -> List[str]:
         """Extract constraint phrases"""
         constraints = []
+        text_lower = text.lower()
         
         # Time constraints
-        if 'at least' in text.lower():
-            match = re.search(r'at least (\d+)', text.lower())
+        if 'at least' in text_lower:
+            match = _AT_LEAST_RE.search(text_lower)
             if match:
                 constraints.append(f"minimum:{match.group(1)}")
         
-        if 'at most' in text.lower():
-            match = re.search(r'at most (\d+)', text.lower())
+        if 'at most' in text_lower:
+            match = _AT_MOST_RE.search(text_lower)
             if match:
                 constraints.append(f"maximum:{match.group(1)}")
         
         # Percentage constraints
-        pct_matches = re.findall(r'(\d+)%', text)
+        pct_matches = _PCT_RE.findall(text)
         for pct in pct_matches:
             constraints.append(f"percentage:{pct}")
         
         # Equality constraints
-        if 'equal' in text.lower() or 'same' in text.lower():
+        if 'equal' in text_lower or 'same' in text_lower:
             constraints.append("equality:true")
         
         return constraints
@@ -147,8 +162,7 @@ class ProblemParser:
         text_upper = text.upper()
         
         # Month initials: JFMAMJJASON_D or JFMAMJJASOND
-        months = "JFMAMJJASOND"
-        if months in text_upper or "JFMAMJJASON" in text_upper:
+        if "JFMAMJJASON" in text_upper:
             return "months"
         
         # Days of week: MTWTFSS or variations
@@ -156,10 +170,8 @@ class ProblemParser:
             return "days_of_week"
         
         # Check for month names in sequence
-        month_names = ["january", "february", "march", "april", "may", "june",
-                      "july", "august", "september", "october", "november", "december"]
         text_lower = text.lower()
-        month_count = sum(1 for month in month_names if month in text_lower)
+        month_count = sum(1 for month in _MONTH_NAMES if month in text_lower)
         if month_count >= 3:
             return "month_names"
         
@@ -171,21 +183,19 @@ class ProblemParser:
         
         if pattern_type == "months":
             # Extract the sequence  
-            match = re.search(r"['\"](.*?)['\"]", text)
+            match = _QUOTED_RE.search(text)
             if match:
                 sequence = match.group(1).upper()
-                months = "JFMAMJJASOND"
+                months = _MONTHS
                 
                 # Handle underscore - it represents the blank to fill
                 if '_' in sequence:
                     # Check which month letter appears fewer times in sequence than in months
                     # JFMAMJJASON_D has all letters except one occurrence is missing
-                    seq_without_underscore = sequence.replace('_', '')
-                    for month_char in months:
-                        count_in_months = months.count(month_char)
-                        count_in_seq = seq_without_underscore.count(month_char)
-                        if count_in_seq < count_in_months:
-                            return month_char
+                    # (Counter subtraction keeps month order and drops non-positive counts)
+                    missing = _MONTHS_COUNTS - Counter(sequence.replace('_', ''))
+                    if missing:
+                        return next(iter(missing))
                     
                     # Fallback: return the character at underscore position
                     pos = sequence.index('_')
@@ -203,7 +213,7 @@ class ProblemParser:
         
         elif pattern_type == "days_of_week":
             days = "SMTWTFS"  # Sunday to Saturday
-            match = re.search(r"['\"](.*?)['\"]", text)
+            match = _QUOTED_RE.search(text)
             if match:
                 sequence = match.group(1).upper()
                 if '_' in sequence:
@@ -244,27 +254,26 @@ class ProblemParser:
     
     def extract_cube_size(self, problem: str) -> Optional[int]:
         """Extract cube size from problem, handling formats like '4x4x4' or '10x10x10'"""
+        problem_lower = problem.lower()
+        
         # First try the explicit pattern
-        match = re.search(r'(\d+)x(\d+)x(\d+)\s*cube', problem.lower())
+        match = self.patterns['cube_dimensions'].search(problem_lower)
         if match:
             sizes = [int(match.group(1)), int(match.group(2)), int(match.group(3))]
             if len(set(sizes)) == 1:  # All same size
                 return sizes[0]
         
-        # Try "NxNxN" format anywhere
-        match = re.search(r'(\d+)x\1x\1', problem)
+        # Try "NxNxN" format anywhere; the first match wins, so "1x1x1 ... 10x10x10"
+        # yields 1 (a separate check for that case could never be reached)
+        match = _NXNXN_RE.search(problem)
         if match:
             return int(match.group(1))
         
         # Look for "27 smaller cubes" (3x3x3), "64 smaller cubes" (4x4x4), etc.
-        if '27' in problem and 'smaller' in problem.lower():
-            return 3
-        if '64' in problem and 'smaller' in problem.lower():
-            return 4
-        if '125' in problem and 'smaller' in problem.lower():
-            return 5
-        if '1000' in problem and 'smaller' in problem.lower() or '1x1x1' in problem and '10x10x10' in problem:
-            return 10
+        if 'smaller' in problem_lower:
+            for count, size in _CUBE_COUNT_SIZES:
+                if count in problem:
+                    return size
         
         return None
     
@@ -294,7 +303,9 @@ class ProblemParser:
 
 
 # Convenience function
+_PARSER = ProblemParser()
+
+
 def parse_problem(problem: str) -> ParsedProblem:
     """Quick function to parse a problem"""
-    parser = ProblemParser()
-    return parser.parse(problem)
+    return _PARSER.parse(problem)
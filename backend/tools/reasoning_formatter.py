@@ -3,11 +3,37 @@ Reasoning Trace Formatter
 Provides human-readable, transparent reasoning traces for explainability
 """
 
+from types import MappingProxyType
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
 
-@dataclass
+# Confidence bars for 0..10 filled cells, built once
+_BARS = [f"[{'█' * i}{'░' * (10 - i)}]" for i in range(11)]
+
+# Human-readable tool names
+_NAME_MAP = {
+    'calculator': 'Mathematical Calculator',
+    'symbolic_solver': 'Symbolic Math Solver (SymPy)',
+    'pattern_analyzer': 'Pattern Recognition Algorithm',
+    'code_executor': 'Code Execution Engine',
+    'logic_reasoner': 'Logical Deduction Engine',
+    'mistral': 'Mistral AI Assistant',
+    'constraint_solver': 'Constraint Satisfaction Solver',
+    'geometry_calculator': 'Geometry Formula Calculator',
+    'logic_trap_detector': 'Classic Logic Trap Database',
+    'worst_case_analyzer': 'Worst-Case Scenario Analyzer',
+    'machine_sequencer': 'Task Sequencing Optimizer',
+    'verifier': 'Answer Verification System',
+    'reasoning_engine': 'Multi-Step Reasoning Engine'
+}
+
+# Section separators
+_EQ70 = "=" * 70 + "\n"
+_DASH70 = "─" * 70 + "\n"
+
+
+@dataclass(slots=True)
 class FormattedTrace:
     """Structured reasoning trace with metadata"""
     step_number: int
@@ -23,23 +49,28 @@ class FormattedTrace:
 class ReasoningFormatter:
     """Formats reasoning chains into transparent, human-readable traces"""
     
-    def __init__(self):
-        self.phase_emojis = {
-            "Understanding": "🔍",
-            "Planning": "📋",
-            "Execution": "⚙️",
-            "Verification": "✓",
-            "Final Answer": "🎯"
-        }
+    # Read-only lookup table shared by all instances
+    phase_emojis = MappingProxyType({
+        "Understanding": "🔍",
+        "Planning": "📋",
+        "Execution": "⚙️",
+        "Verification": "✓",
+        "Final Answer": "🎯"
+    })
     
     def format_step(self, step, step_type: str = "Execution") -> str:
         """
         Format a single reasoning step with rich context
         """
+        parts = []
+        self._format_step_into(step, step_type, parts)
+        return "".join(parts)
+    
+    def _format_step_into(self, step, step_type: str, parts: List[str]) -> None:
+        """Append the fragments of a formatted step to parts"""
         emoji = self.phase_emojis.get(step_type, "•")
         
         # Build detailed explanation
-        parts = []
         parts.append(f"{emoji} **Step {step.step_number}: {step.action}**\n")
         
         # Add thought process
@@ -62,29 +93,29 @@ class ReasoningFormatter:
         if step.confidence > 0 and step.confidence < 1:
             confidence_bar = self._confidence_bar(step.confidence)
             parts.append(f"   📊 Confidence: {confidence_bar} {step.confidence:.1%}\n")
-        
-        return "".join(parts)
     
     def format_chain(self, chain) -> str:
         """
         Format entire reasoning chain with structure
         """
         output = []
-        output.append("=" * 70 + "\n")
+        output.append(_EQ70)
         output.append("🧠 REASONING TRACE\n")
-        output.append("=" * 70 + "\n\n")
+        output.append(_EQ70)
+        output.append("\n")
         
         # Problem statement
-        problem_preview = chain.problem[:100] + "..." if len(chain.problem) > 100 else chain.problem
+        problem_preview = f"{chain.problem[:100]}..." if len(chain.problem) > 100 else chain.problem
         output.append(f"📝 Problem: {problem_preview}\n")
         output.append(f"🏷️  Type: {chain.plan.problem_type.value}\n")
         output.append(f"🎯 Strategy: {chain.plan.strategy.value}\n")
         output.append("\n")
         
         # Steps grouped by phase
-        output.append("─" * 70 + "\n")
+        output.append(_DASH70)
         output.append("REASONING STEPS\n")
-        output.append("─" * 70 + "\n\n")
+        output.append(_DASH70)
+        output.append("\n")
         
         for i, step in enumerate(chain.steps, 1):
             # Determine phase
@@ -95,14 +126,14 @@ class ReasoningFormatter:
             else:
                 phase = "Execution"
             
-            output.append(self.format_step(step, phase))
+            self._format_step_into(step, phase, output)
             output.append("\n")
         
         # Final answer section
-        output.append("=" * 70 + "\n")
+        output.append(_EQ70)
         output.append(f"🎯 FINAL ANSWER: {chain.final_answer}\n")
         output.append(f"📊 Overall Confidence: {self._confidence_bar(chain.overall_confidence)} {chain.overall_confidence:.1%}\n")
-        output.append("=" * 70 + "\n")
+        output.append(_EQ70)
         
         return "".join(output)
     
@@ -131,22 +162,10 @@ class ReasoningFormatter:
     
     def _format_tool_name(self, tool: str) -> str:
         """Format tool names to be human-readable"""
-        name_map = {
-            'calculator': 'Mathematical Calculator',
-            'symbolic_solver': 'Symbolic Math Solver (SymPy)',
-            'pattern_analyzer': 'Pattern Recognition Algorithm',
-            'code_executor': 'Code Execution Engine',
-            'logic_reasoner': 'Logical Deduction Engine',
-            'mistral': 'Mistral AI Assistant',
-            'constraint_solver': 'Constraint Satisfaction Solver',
-            'geometry_calculator': 'Geometry Formula Calculator',
-            'logic_trap_detector': 'Classic Logic Trap Database',
-            'worst_case_analyzer': 'Worst-Case Scenario Analyzer',
-            'machine_sequencer': 'Task Sequencing Optimizer',
-            'verifier': 'Answer Verification System',
-            'reasoning_engine': 'Multi-Step Reasoning Engine'
-        }
-        return name_map.get(tool, tool.replace('_', ' ').title())
+        name = _NAME_MAP.get(tool)
+        if name:
+            return name
+        return tool.replace('_', ' ').title() if '_' in tool else tool.title()
     
     def _format_value(self, value: Any) -> str:
         """Format values for display"""
@@ -160,9 +179,7 @@ class ReasoningFormatter:
     
     def _confidence_bar(self, confidence: float) -> str:
         """Visual confidence bar"""
-        filled = int(confidence * 10)
-        bar = "█" * filled + "░" * (10 - filled)
-        return f"[{bar}]"
+        return _BARS[min(10, max(0, int(confidence * 10)))]
     
     def export_to_dict(self, chain) -> Dict:
         """
@@ -186,17 +203,18 @@ class ReasoningFormatter:
             ],
             'final_answer': chain.final_answer,
             'overall_confidence': chain.overall_confidence,
-            'tools_used': list(set(step.tool_used for step in chain.steps if step.tool_used))
+            'tools_used': list(dict.fromkeys(step.tool_used for step in chain.steps if step.tool_used))
         }
 
 
 # Convenience functions
+_FORMATTER = ReasoningFormatter()
+
+
 def format_reasoning_trace(chain) -> str:
     """Quick function to format reasoning chain"""
-    formatter = ReasoningFormatter()
-    return formatter.format_chain(chain)
+    return _FORMATTER.format_chain(chain)
 
 def export_reasoning_json(chain) -> Dict:
     """Quick function to export reasoning to JSON"""
-    formatter = ReasoningFormatter()
-    return formatter.export_to_dict(chain)
+    return _FORMATTER.export_to_dict(chain)
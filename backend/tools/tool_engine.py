@@ -4,8 +4,13 @@ Provides various tools for reasoning: calculators, symbolic solvers, code execut
 """
 
 import ast
+import inspect
 import operator
 import re
+from fractions import Fraction
+from functools import lru_cache
+from itertools import pairwise
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Union
 from sympy import symbols, solve, simplify, sympify, lcm, gcd, factorial
 from sympy.parsing.sympy_parser import parse_expr
@@ -17,6 +22,104 @@ class ToolExecutionError(Exception):
     pass
 
 
+# Names visible to the Calculator's eval fallback (read-only, shared across calls)
+_ALLOWED_NAMES = MappingProxyType({
+    'abs': abs, 'round': round, 'min': min, 'max': max,
+    'sum': sum, 'pow': pow,
+    'sqrt': math.sqrt, 'sin': math.sin, 'cos': math.cos,
+    'tan': math.tan, 'log': math.log, 'exp': math.exp,
+    'pi': math.pi, 'e': math.e
+})
+
+
+@lru_cache(maxsize=1024)
+def _normalize_expression(expression: str) -> str:
+    """Remove spaces and replace ^ with **"""
+    return expression.replace(" ", "").replace("^", "**")
+
+
+# Plain arithmetic: numbers, + - * / ** and parentheses only
+_ARITH_RE = re.compile(r'^[\d\.\+\-\*\/\(\)\s^]+$')
+# sympy keeps extra precision for float literals longer than 15 digits
+_LONG_FLOAT_RE = re.compile(r'(?:\d\.?){16}')
+_ARITH_BINOPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub,
+    ast.Mult: operator.mul, ast.Div: operator.truediv,
+}
+_ARITH_UNARYOPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_MAX_EXPONENT = 1000
+
+
+class _NotArithmetic(Exception):
+    """Expression needs the sympy path"""
+
+
+def _arith_node(node):
+    """Evaluate a whitelisted AST node; integers stay exact like sympy Rationals"""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return Fraction(node.value) if type(node.value) is int else node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ARITH_UNARYOPS:
+        return _ARITH_UNARYOPS[type(node.op)](_arith_node(node.operand))
+    if isinstance(node, ast.BinOp):
+        left, right = _arith_node(node.left), _arith_node(node.right)
+        if type(node.op) in _ARITH_BINOPS:
+            return _ARITH_BINOPS[type(node.op)](left, right)
+        if (isinstance(node.op, ast.Pow) and isinstance(left, Fraction)
+                and isinstance(right, Fraction) and right.denominator == 1
+                and abs(right) <= _MAX_EXPONENT):
+            return left ** right
+    raise _NotArithmetic
+
+
+@lru_cache(maxsize=1024)
+def _arith_value(expression: str) -> Optional[float]:
+    """Value of a plain arithmetic expression without sympy, None if it needs sympy"""
+    if not _ARITH_RE.match(expression) or _LONG_FLOAT_RE.search(expression):
+        return None
+    try:
+        return float(_arith_node(ast.parse(expression, mode='eval').body))
+    except (_NotArithmetic, SyntaxError, ArithmeticError, RecursionError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _sympy_value(expression: str) -> Optional[float]:
+    """Numeric value of a normalized expression via sympy, None if it has none"""
+    try:
+        return float(sympify(expression).evalf())
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression(expression: str):
+    """Compiled code object for the eval fallback"""
+    return compile(expression, "<string>", "eval")
+
+
+# Runs of spaces/tabs are insignificant to parse_expr; collapse them for cache keys
+_BLANKS_RE = re.compile(r'[ \t]+')
+
+
+@lru_cache(maxsize=512)
+def _cached_parse(expression: str):
+    """parse_expr result for a normalized expression string"""
+    return parse_expr(expression)
+
+
+@lru_cache(maxsize=512)
+def _cached_simplify(expression: str) -> str:
+    """Simplified form of a normalized expression string"""
+    return str(simplify(_cached_parse(expression)))
+
+
+@lru_cache(maxsize=512)
+def _cached_solve(equation: str, variable: str) -> tuple:
+    """Solutions of a normalized equation string, real ones as floats"""
+    solutions = solve(_cached_parse(equation), symbols(variable))
+    return tuple(float(sol.evalf()) if sol.is_real else sol for sol in solutions)
+
+
 class Calculator:
     """Basic calculator for arithmetic operations"""
     
@@ -24,29 +127,21 @@ class Calculator:
     def evaluate(expression: str) -> float:
         """Safely evaluate mathematical expressions"""
         try:
-            # Remove spaces
-            expression = expression.replace(" ", "")
+            expression = _normalize_expression(expression)
             
-            # Replace common math functions
-            expression = expression.replace("^", "**")
+            # Plain arithmetic needs neither sympy nor the names table
+            result = _arith_value(expression)
+            if result is not None:
+                return result
             
-            # Safe evaluation using ast
-            allowed_names = {
-                'abs': abs, 'round': round, 'min': min, 'max': max,
-                'sum': sum, 'pow': pow,
-                'sqrt': math.sqrt, 'sin': math.sin, 'cos': math.cos,
-                'tan': math.tan, 'log': math.log, 'exp': math.exp,
-                'pi': math.pi, 'e': math.e
-            }
+            # Try sympy for better math support
+            result = _sympy_value(expression)
+            if result is not None:
+                return result
             
-            # Try sympy first for better math support
-            try:
-                result = sympify(expression)
-                return float(result.evalf())
-            except:
-                # Fallback to ast eval
-                code = compile(expression, "<string>", "eval")
-                return eval(code, {"__builtins__": {}}, allowed_names)
+            # Fallback to ast eval
+            code = _compile_expression(expression)
+            return eval(code, {"__builtins__": {}}, _ALLOWED_NAMES)
                 
         except Exception as e:
             raise ToolExecutionError(f"Calculator error: {str(e)}")
@@ -80,10 +175,7 @@ class SymbolicSolver:
     def solve_equation(equation: str, variable: str = 'x') -> List[Any]:
         """Solve algebraic equations"""
         try:
-            var = symbols(variable)
-            eq = parse_expr(equation)
-            solutions = solve(eq, var)
-            return [float(sol.evalf()) if sol.is_real else sol for sol in solutions]
+            return list(_cached_solve(_BLANKS_RE.sub(' ', equation).strip(), variable))
         except Exception as e:
             raise ToolExecutionError(f"Symbolic solver error: {str(e)}")
     
@@ -91,8 +183,7 @@ class SymbolicSolver:
     def simplify(expression: str) -> str:
         """Simplify mathematical expressions"""
         try:
-            expr = parse_expr(expression)
-            return str(simplify(expr))
+            return _cached_simplify(_BLANKS_RE.sub(' ', expression).strip())
         except Exception as e:
             raise ToolExecutionError(f"Simplification error: {str(e)}")
     
@@ -100,6 +191,8 @@ class SymbolicSolver:
     def find_lcm(*numbers) -> int:
         """Find least common multiple"""
         try:
+            if len(numbers) > 1 and all(type(n) is int for n in numbers):
+                return math.lcm(*numbers)
             result = numbers[0]
             for num in numbers[1:]:
                 result = lcm(result, num)
@@ -111,6 +204,8 @@ class SymbolicSolver:
     def find_gcd(*numbers) -> int:
         """Find greatest common divisor"""
         try:
+            if len(numbers) > 1 and all(type(n) is int for n in numbers):
+                return math.gcd(*numbers)
             result = numbers[0]
             for num in numbers[1:]:
                 result = gcd(result, num)
@@ -122,11 +217,21 @@ class SymbolicSolver:
     def factorial(n: int) -> int:
         """Calculate factorial"""
         try:
+            if type(n) is int and n >= 0:
+                return math.factorial(n)
             return int(factorial(n))
         except Exception as e:
             raise ToolExecutionError(f"Factorial error: {str(e)}")
 
 
+def _constant_step(values: List[float]) -> Optional[float]:
+    """First value if every value is within 1e-9 of it, else None"""
+    first = values[0]
+    if all(abs(value - first) < 1e-9 for value in values):
+        return first
+    return None
+
+
 class PatternAnalyzer:
     """Analyzes sequences and patterns"""
     
@@ -136,13 +241,8 @@ class PatternAnalyzer:
         if len(sequence) < 2:
             return None
         
-        differences = [sequence[i+1] - sequence[i] for i in range(len(sequence)-1)]
-        
         # Check if all differences are the same
-        if len(set(differences)) == 1:
-            return differences[0]
-        
-        return None
+        return _constant_step([b - a for a, b in pairwise(sequence)])
     
     @staticmethod
     def find_geometric_pattern(sequence: List[float]) -> Optional[float]:
@@ -150,7 +250,7 @@ class PatternAnalyzer:
         if len(sequence) < 2 or any(x == 0 for x in sequence[:-1]):
             return None
         
-        ratios = [sequence[i+1] / sequence[i] for i in range(len(sequence)-1)]
+        ratios = [b / a for a, b in pairwise(sequence)]
         
         # Check if all ratios are the same (within tolerance)
         if all(abs(r - ratios[0]) < 1e-6 for r in ratios):
@@ -165,13 +265,13 @@ class PatternAnalyzer:
             return None
         
         # Try first differences
-        diff1 = [sequence[i+1] - sequence[i] for i in range(len(sequence)-1)]
+        diff1 = [b - a for a, b in pairwise(sequence)]
         if PatternAnalyzer.find_arithmetic_pattern(diff1):
             return "quadratic"
         
         # Try second differences
         if len(diff1) >= 2:
-            diff2 = [diff1[i+1] - diff1[i] for i in range(len(diff1)-1)]
+            diff2 = [b - a for a, b in pairwise(diff1)]
             if PatternAnalyzer.find_arithmetic_pattern(diff2):
                 return "quadratic"
         
@@ -180,10 +280,13 @@ class PatternAnalyzer:
     @staticmethod
     def predict_next(sequence: List[float]) -> Optional[float]:
         """Predict the next number in a sequence"""
+        diff1 = [b - a for a, b in pairwise(sequence)]
+        
         # Try arithmetic
-        diff = PatternAnalyzer.find_arithmetic_pattern(sequence)
-        if diff is not None:
-            return sequence[-1] + diff
+        if diff1:
+            diff = _constant_step(diff1)
+            if diff is not None:
+                return sequence[-1] + diff
         
         # Try geometric
         ratio = PatternAnalyzer.find_geometric_pattern(sequence)
@@ -192,17 +295,33 @@ class PatternAnalyzer:
         
         # Try quadratic (constant second difference)
         if len(sequence) >= 3:
-            diff1 = [sequence[i+1] - sequence[i] for i in range(len(sequence)-1)]
-            diff2 = [diff1[i+1] - diff1[i] for i in range(len(diff1)-1)]
-            
-            if len(set(diff2)) == 1:
+            diff2 = _constant_step([b - a for a, b in pairwise(diff1)])
+            if diff2 is not None:
                 # Quadratic pattern
-                next_diff1 = diff1[-1] + diff2[0]
+                next_diff1 = diff1[-1] + diff2
                 return sequence[-1] + next_diff1
         
         return None
 
 
+# Restricted builtins for CodeExecutor; copied per call so snippets cannot leak state
+_SAFE_BUILTINS = MappingProxyType({
+    'range': range, 'len': len, 'sum': sum,
+    'min': min, 'max': max, 'abs': abs,
+    'int': int, 'float': float, 'str': str,
+    'list': list, 'dict': dict, 'set': set,
+    'enumerate': enumerate, 'zip': zip,
+    'sorted': sorted, 'reversed': reversed,
+    'print': print
+})
+
+
+@lru_cache(maxsize=256)
+def _compile_user_code(code: str):
+    """Compiled code object for a CodeExecutor snippet"""
+    return compile(code, "<string>", "exec")
+
+
 class CodeExecutor:
     """Safe Python code execution for computational problems"""
     
@@ -210,24 +329,13 @@ class CodeExecutor:
     def execute(code: str, timeout: int = 5) -> Any:
         """Execute Python code safely with timeout"""
         try:
-            # Create restricted globals
-            safe_globals = {
-                '__builtins__': {
-                    'range': range, 'len': len, 'sum': sum,
-                    'min': min, 'max': max, 'abs': abs,
-                    'int': int, 'float': float, 'str': str,
-                    'list': list, 'dict': dict, 'set': set,
-                    'enumerate': enumerate, 'zip': zip,
-                    'sorted': sorted, 'reversed': reversed,
-                    'print': print
-                },
-                'math': math
-            }
-            
             local_vars = {}
             
+            # Create restricted globals
+            safe_globals = {'__builtins__': dict(_SAFE_BUILTINS), 'math': math}
+            
             # Execute code
-            exec(code, safe_globals, local_vars)
+            exec(_compile_user_code(code), safe_globals, local_vars)
             
             # Return the result variable if it exists
             if 'result' in local_vars:
@@ -250,13 +358,11 @@ class LogicReasoner:
         
         for stmt in statements:
             if 'variable' in stmt and 'value' in stmt:
-                var = stmt['variable']
                 val = stmt['value']
                 
-                if var in facts and facts[var] != val:
+                # First value seen for a variable is the one later statements must match
+                if facts.setdefault(stmt['variable'], val) != val:
                     return False
-                
-                facts[var] = val
         
         return True
     
@@ -301,6 +407,14 @@ class ToolEngine:
             except Exception as e:
                 print(f"Note: Mistral tool not available: {str(e)}")
                 pass
+        
+        # (tool name, method name) -> bound method for the public methods of each tool
+        self._dispatch = {
+            (name, method_name): method_func
+            for name, tool in self.tool_registry.items()
+            for method_name, method_func in inspect.getmembers(tool, callable)
+            if not method_name.startswith('_')
+        }
     
     def get_tool(self, tool_name: str):
         """Get a specific tool by name"""
@@ -310,12 +424,18 @@ class ToolEngine:
     
     def execute_tool(self, tool_name: str, method: str, *args, **kwargs) -> Any:
         """Execute a tool method"""
+        method_func = self._dispatch.get((tool_name, method))
+        if method_func is None:
+            # Tools registered after construction and non-public attributes
+            try:
+                method_func = getattr(self.get_tool(tool_name), method)
+            except AttributeError:
+                raise ToolExecutionError(f"Tool {tool_name} has no method {method}")
+            except Exception as e:
+                raise ToolExecutionError(f"Tool execution failed: {str(e)}")
+        
         try:
-            tool = self.get_tool(tool_name)
-            method_func = getattr(tool, method)
             return method_func(*args, **kwargs)
-        except AttributeError:
-            raise ToolExecutionError(f"Tool {tool_name} has no method {method}")
         except Exception as e:
             raise ToolExecutionError(f"Tool execution failed: {str(e)}")
     
@@ -12,6 +12,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 from reasoning_system import create_reasoning_system
 
 
+# Cheap calls that load sympy/numpy code paths before the first timed example
+_WARMUP_CALLS = (
+    ('calculator', 'evaluate', 'sqrt(4)+1'),
+    ('symbolic_solver', 'simplify', 'x+x'),
+    ('pattern_analyzer', 'predict_next', [1, 2, 3]),
+)
+
+
+def _warmup(system):
+    """Run each local tool once so first-call costs are paid at startup"""
+    tool_engine = system.reasoner.tool_engine
+    for tool_name, method, arg in _WARMUP_CALLS:
+        try:
+            tool_engine.execute_tool(tool_name, method, arg)
+        except Exception:
+            pass
+
+
 def demo_examples():
     """Run demo with various example problems"""
     
@@ -22,6 +40,7 @@ def demo_examples():
     
     # Create reasoning system
     system = create_reasoning_system(verbose=True)
+    _warmup(system)
     
     # Example problems
     examples = [
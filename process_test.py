@@ -6,7 +6,12 @@ Reads problems, solves them using the Agentic Reasoning System, and outputs pred
 import csv
 import sys
 import os
-from typing import List, Dict
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 # Fix Windows console encoding for emojis
@@ -19,49 +24,90 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 from reasoning_system import create_reasoning_system
 
 
+# Answer option columns, fetched in one call per row
+_OPTION_KEYS = tuple(f'answer_option_{i}' for i in range(1, 6))
+_get_options = itemgetter(*_OPTION_KEYS)
+
+
 def parse_csv_row(row: Dict) -> Dict:
     """Parse a CSV row into problem data"""
-    problem_data = {
+    try:
+        options = _get_options(row)
+    except KeyError:
+        # Missing columns; a missing fifth option defaults to "Another answer"
+        options = [row.get(key, '') for key in _OPTION_KEYS[:4]]
+        options.append(row.get(_OPTION_KEYS[4], 'Another answer'))
+    
+    return {
         'topic': row.get('topic', ''),
         'problem': row.get('problem_statement', ''),
-        'options': [
-            row.get('answer_option_1', ''),
-            row.get('answer_option_2', ''),
-            row.get('answer_option_3', ''),
-            row.get('answer_option_4', ''),
-            row.get('answer_option_5', 'Another answer')
-        ]
+        # Remove empty options
+        'options': [opt for opt in options if opt]
     }
-    
-    # Remove empty options
-    problem_data['options'] = [opt for opt in problem_data['options'] if opt]
-    
-    return problem_data
 
 
 def find_matching_option(answer: str, options: List[str]) -> str:
     """Find which option matches the answer"""
     answer_lower = answer.lower().strip()
+    options_lower = [opt.lower() for opt in options]
     
-    # Try exact match first
-    for i, opt in enumerate(options, 1):
-        if answer_lower == opt.lower().strip():
-            return f"answer_option_{i}"
+    # Try exact match first (membership and index scans run in C, first hit wins)
+    options_stripped = [opt.strip() for opt in options_lower]
+    if answer_lower in options_stripped:
+        return f"answer_option_{options_stripped.index(answer_lower) + 1}"
     
     # Try partial match
-    for i, opt in enumerate(options, 1):
-        if answer_lower in opt.lower() or opt.lower() in answer_lower:
+    for i, opt in enumerate(options_lower, 1):
+        if answer_lower in opt or opt in answer_lower:
             return f"answer_option_{i}"
     
     # Check for "Another answer"
-    if any("another" in opt.lower() for opt in options):
+    if any("another" in opt for opt in options_lower):
         return f"answer_option_5"
     
     # Default to option 1 if no match
     return "answer_option_1"
 
 
-def process_test_file(input_file: str, output_file: str, verbose: bool = True):
+# Reasoning system owned by each pool worker process
+_worker_system = None
+
+
+def _init_worker(verbose: bool):
+    """Create one reasoning system per worker process"""
+    global _worker_system
+    _worker_system = create_reasoning_system(verbose=verbose)
+
+
+def _solve_one(prob_data: Dict, system=None) -> Tuple[Optional[object], Optional[str]]:
+    """Solve a single problem, returning (result, None) or (None, error message)"""
+    system = system or _worker_system
+    try:
+        result = system.solve(
+            problem=prob_data['problem'],
+            topic=prob_data['topic'],
+            options=prob_data['options']
+        )
+        return result, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _solve_bounded(pool: ProcessPoolExecutor, problems: Iterable[Dict],
+                   in_flight: int) -> Iterator[Tuple[Dict, Tuple]]:
+    """Yield (problem, (result, error)) in input order, submitting at most in_flight rows at a time"""
+    problems = iter(problems)
+    pending = deque((p, pool.submit(_solve_one, p)) for p in islice(problems, in_flight))
+    while pending:
+        prob_data, future = pending.popleft()
+        # Top the window back up before waiting on the oldest row
+        for p in islice(problems, 1):
+            pending.append((p, pool.submit(_solve_one, p)))
+        yield prob_data, future.result()
+
+
+def process_test_file(input_file: str, output_file: str, verbose: bool = True,
+                      workers: int = 1):
     """
     Process test CSV and generate predictions
     
@@ -69,6 +115,7 @@ def process_test_file(input_file: str, output_file: str, verbose: bool = True):
         input_file: Path to test.csv
         output_file: Path to output prediction CSV
         verbose: Whether to print progress
+        workers: Number of worker processes; 1 (the default) solves in-process
     """
     
     print(f"\n{'='*70}")
@@ -81,72 +128,86 @@ def process_test_file(input_file: str, output_file: str, verbose: bool = True):
     # Create reasoning system
     system = create_reasoning_system(verbose=verbose)
     
-    # Read test file
-    problems = []
+    # Count rows for progress display; problems are parsed lazily while solving
     with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            problem_data = parse_csv_row(row)
-            problem_data['original_row'] = row
-            problems.append(problem_data)
+        total = max(sum(1 for _ in csv.reader(f)) - 1, 0)
     
-    print(f"📚 Loaded {len(problems)} problems\n")
+    print(f"📚 Loaded {total} problems\n")
     
-    # Solve all problems
-    results = []
+    # Solve all problems, writing each prediction as soon as it is ready
+    topic_counts = Counter()
     start_time = datetime.now()
     
-    for i, prob_data in enumerate(problems, 1):
-        print(f"\n{'─'*70}")
-        print(f"Problem {i}/{len(problems)}")
-        print(f"{'─'*70}")
-        print(f"Topic: {prob_data['topic']}")
-        print(f"Problem: {prob_data['problem'][:80]}...")
+    # Problems are independent; with several workers each process gets its own system
+    pool = (ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(verbose,))
+            if workers > 1 else nullcontext())
+    
+    with pool, open(input_file, 'r', encoding='utf-8') as f, \
+            open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as out:
+        writer = csv.DictWriter(
+            out, fieldnames=['topic', 'problem_statement', 'solution', 'correct_option']
+        )
+        writer.writeheader()
         
-        try:
-            result = system.solve(
-                problem=prob_data['problem'],
-                topic=prob_data['topic'],
-                options=prob_data['options']
-            )
-            
-            # Find which option was selected
-            correct_option = find_matching_option(result.answer, prob_data['options'])
+        problems = map(parse_csv_row, csv.DictReader(f))
+        if workers > 1:
+            # Keep only a couple of rows per worker in flight so memory stays bounded
+            solved = _solve_bounded(pool, problems, in_flight=workers * 2)
+        else:
+            solved = ((p, _solve_one(p, system)) for p in problems)
+        
+        for i, (prob_data, (result, error)) in enumerate(solved, 1):
+            print(f"\n{'─'*70}")
+            print(f"Problem {i}/{total}")
+            print(f"{'─'*70}")
+            print(f"Topic: {prob_data['topic']}")
+            print(f"Problem: {prob_data['problem'][:80]}...")
             
-            results.append({
-                'topic': prob_data['topic'],
-                'problem_statement': prob_data['problem'],
-                'solution': result.reasoning_chain.get_summary(),
-                'correct_option': correct_option,
-                'answer': result.answer,
-                'confidence': result.confidence
-            })
+            if result is not None:
+                # Keep statistics and trace export working for results from workers
+                system.solution_cache[prob_data['problem']] = result
+                
+                try:
+                    # Find which option was selected
+                    correct_option = find_matching_option(result.answer, prob_data['options'])
+                    
+                    writer.writerow({
+                        'topic': prob_data['topic'],
+                        'problem_statement': prob_data['problem'],
+                        'solution': result.reasoning_chain.get_summary(),
+                        'correct_option': correct_option
+                    })
+                    
+                    print(f"✅ Answer: {result.answer}")
+                    print(f"   Option: {correct_option}")
+                    print(f"   Confidence: {result.confidence:.1%}")
+                    
+                except Exception as e:
+                    error = str(e)
             
-            print(f"✅ Answer: {result.answer}")
-            print(f"   Option: {correct_option}")
-            print(f"   Confidence: {result.confidence:.1%}")
+            if error is not None:
+                print(f"❌ Error solving problem: {error}")
+                writer.writerow({
+                    'topic': prob_data['topic'],
+                    'problem_statement': prob_data['problem'],
+                    'solution': f"Error: {error}",
+                    'correct_option': 'answer_option_1'
+                })
             
-        except Exception as e:
-            print(f"❌ Error solving problem: {str(e)}")
-            results.append({
-                'topic': prob_data['topic'],
-                'problem_statement': prob_data['problem'],
-                'solution': f"Error: {str(e)}",
-                'correct_option': 'answer_option_1',
-                'answer': 'Error',
-                'confidence': 0.0
-            })
+            topic_counts[prob_data['topic']] += 1
     
     # Calculate statistics
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
+    problem_count = sum(topic_counts.values())
     
     print(f"\n{'='*70}")
     print(f"📊 PROCESSING COMPLETE")
     print(f"{'='*70}")
-    print(f"Total Problems: {len(problems)}")
+    print(f"Total Problems: {problem_count}")
     print(f"Time Taken: {duration:.1f}s")
-    print(f"Average Time: {duration/len(problems):.2f}s per problem")
+    print(f"Average Time: {duration/problem_count:.2f}s per problem")
     
     stats = system.get_statistics()
     if stats:
@@ -156,20 +217,6 @@ def process_test_file(input_file: str, output_file: str, verbose: bool = True):
         print(f"  Low (<60%): {stats.get('low_confidence_count', 0)}")
         print(f"  Average: {stats.get('average_confidence', 0):.1%}")
     
-    # Write output CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['topic', 'problem_statement', 'solution', 'correct_option']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for result in results:
-            writer.writerow({
-                'topic': result['topic'],
-                'problem_statement': result['problem_statement'],
-                'solution': result['solution'],
-                'correct_option': result['correct_option']
-            })
-    
     print(f"\n✅ Predictions saved to: {output_file}")
     
     # Export detailed reasoning traces
@@ -184,23 +231,18 @@ def process_test_file(input_file: str, output_file: str, verbose: bool = True):
         f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Input File: {input_file}\n")
         f.write(f"Output File: {output_file}\n\n")
-        f.write(f"Total Problems: {len(problems)}\n")
+        f.write(f"Total Problems: {problem_count}\n")
         f.write(f"Processing Time: {duration:.1f}s\n")
-        f.write(f"Average Time: {duration/len(problems):.2f}s per problem\n\n")
+        f.write(f"Average Time: {duration/problem_count:.2f}s per problem\n\n")
         
         if stats:
             f.write("Confidence Distribution:\n")
-            f.write(f"  High (>80%): {stats.get('high_confidence_count', 0)} ({stats.get('high_confidence_count', 0)/len(problems)*100:.1f}%)\n")
-            f.write(f"  Medium (60-80%): {stats.get('medium_confidence_count', 0)} ({stats.get('medium_confidence_count', 0)/len(problems)*100:.1f}%)\n")
-            f.write(f"  Low (<60%): {stats.get('low_confidence_count', 0)} ({stats.get('low_confidence_count', 0)/len(problems)*100:.1f}%)\n")
+            f.write(f"  High (>80%): {stats.get('high_confidence_count', 0)} ({stats.get('high_confidence_count', 0)/problem_count*100:.1f}%)\n")
+            f.write(f"  Medium (60-80%): {stats.get('medium_confidence_count', 0)} ({stats.get('medium_confidence_count', 0)/problem_count*100:.1f}%)\n")
+            f.write(f"  Low (<60%): {stats.get('low_confidence_count', 0)} ({stats.get('low_confidence_count', 0)/problem_count*100:.1f}%)\n")
             f.write(f"  Average Confidence: {stats.get('average_confidence', 0):.1%}\n\n")
         
         f.write("\nProblem Breakdown by Topic:\n")
-        topic_counts = {}
-        for result in results:
-            topic = result['topic']
-            topic_counts[topic] = topic_counts.get(topic, 0) + 1
-        
         for topic, count in sorted(topic_counts.items(), key=lambda x: x[1], reverse=True):
             f.write(f"  {topic}: {count}\n")
     
@@ -218,6 +260,8 @@ if __name__ == "__main__":
                        help='Output predictions CSV file')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress verbose output')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Number of worker processes (default 1 solves in-process)')
     
     args = parser.parse_args()
     
@@ -228,4 +272,5 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Process the test file
-    process_test_file(args.input, args.output, verbose=not args.quiet)
+    process_test_file(args.input, args.output, verbose=not args.quiet,
+                      workers=args.workers)